@@ -0,0 +1,21 @@
+# gunicorn_conf.py - arbiter hooks for the Binaural Beats Generator
+"""
+Staggers worker forks so each worker finishes its import and kernel
+warm-up before the next one starts, avoiding a cold-start CPU pile-up
+on small Railway containers.
+"""
+import os
+import time
+
+# Seconds between worker forks; set to 0 to disable staggering
+WORKER_STAGGER_SECONDS = float(os.getenv("WORKER_STAGGER_SECONDS", "2"))
+
+_forked_once = False
+
+
+def pre_fork(server, worker):
+    """Called by the arbiter before each worker fork"""
+    global _forked_once
+    if _forked_once and WORKER_STAGGER_SECONDS > 0:
+        time.sleep(WORKER_STAGGER_SECONDS)
+    _forked_once = True
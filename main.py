@@ -1,23 +1,29 @@
 # main.py - Binaural Beats Generator MVP for Railway
 import asyncio
+import hashlib
+import itertools
 import json
 import math
 import os
+import signal
+import struct
+import threading
 import time
 import logging
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime
 
+import msgspec
 import numpy as np
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
+from cachetools import LRUCache, TTLCache
+from numba import njit
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import jwt
-from pydantic import BaseModel, Field
-import uvicorn
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +34,10 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 JWT_SECRET = os.getenv("JWT_SECRET", "binaural-beats-secret-key-change-in-production")
+# Whether a real secret was supplied (the fallback above doesn't count);
+# computed once so logs don't re-read the environment
+JWT_CONFIGURED = "Yes" if os.environ.get("JWT_SECRET") else "No"
+PORT = int(os.environ.get("PORT", 8000))
 SAMPLE_RATE = 44100
 BUFFER_SIZE = 1024
 
@@ -35,134 +45,373 @@ BUFFER_SIZE = 1024
 startup_time = time.time()
 
 # Data Models
-class BinauralConfig(BaseModel):
-    carrier_freq: float = Field(ge=40, le=1000, description="Base frequency in Hz")
-    beat_freq: float = Field(ge=0.5, le=40, description="Beat frequency in Hz")
-    waveform: str = Field(default="sine", pattern="^(sine|square|sawtooth|triangle)$")
-    duration: int = Field(ge=1, le=3600, description="Duration in seconds")
-    volume: float = Field(ge=0.0, le=1.0, default=0.5)
-
-class SessionData(BaseModel):
+class BinauralConfig(msgspec.Struct, frozen=True):
+    """Binaural beat parameters, range-checked by validate_config"""
+    carrier_freq: float  # Base frequency in Hz (40-1000)
+    beat_freq: float     # Beat frequency in Hz (0.5-40)
+    duration: int        # Duration in seconds (1-3600)
+    waveform: str = "sine"
+    volume: float = 0.5
+
+
+# Precompiled decoder: msgspec validates and decodes the request body in
+# one C-level pass instead of Pydantic's per-field model build
+_CONFIG_DECODER = msgspec.json.Decoder(BinauralConfig)
+
+
+def validate_config(config: BinauralConfig):
+    """Enforce the parameter ranges the Pydantic fields used to carry"""
+    if not 40 <= config.carrier_freq <= 1000:
+        raise HTTPException(status_code=422, detail="carrier_freq must be 40-1000 Hz")
+    if not 0.5 <= config.beat_freq <= 40:
+        raise HTTPException(status_code=422, detail="beat_freq must be 0.5-40 Hz")
+    if config.waveform not in _KERNELS:
+        raise HTTPException(
+            status_code=422,
+            detail="waveform must be one of: sine, square, sawtooth, triangle"
+        )
+    if not 1 <= config.duration <= 3600:
+        raise HTTPException(status_code=422, detail="duration must be 1-3600 seconds")
+    if not 0.0 <= config.volume <= 1.0:
+        raise HTTPException(status_code=422, detail="volume must be 0.0-1.0")
+
+
+@dataclass
+class SessionData:
     session_id: str
     config: BinauralConfig
-    start_time: datetime
+    start_time: datetime  # wall clock, reported on API boundaries only
     is_active: bool = True
+    # Monotonic start for elapsed-time math; immune to wall-clock jumps
+    # and much cheaper than building datetime objects per frame
+    start_mono: float = field(default_factory=time.monotonic)
 
 @dataclass
 class AudioBuffer:
-    left_channel: np.ndarray
-    right_channel: np.ndarray
+    samples: np.ndarray  # shape (2, buffer_size) float32; row 0 = left, row 1 = right
     timestamp: float
 
+    @property
+    def left_channel(self) -> np.ndarray:
+        return self.samples[0]
+
+    @property
+    def right_channel(self) -> np.ndarray:
+        return self.samples[1]
+
+# Specialized per-waveform kernels: dispatching once per buffer keeps the
+# inner loop branch-free so each kernel is a single streaming SIMD pass.
+# All phases are in cycles ([0, 1)); each kernel returns the updated
+# (phase_l, phase_r) pair so streamed buffers stay phase-continuous.
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _fill_sine(out_left, out_right, phase_l, phase_r, dphase_l, dphase_r, volume):
+    two_pi = 2.0 * math.pi
+    for i in range(out_left.shape[0]):
+        out_left[i] = volume * math.sin(two_pi * phase_l)
+        out_right[i] = volume * math.sin(two_pi * phase_r)
+        phase_l += dphase_l
+        phase_l -= math.floor(phase_l)
+        phase_r += dphase_r
+        phase_r -= math.floor(phase_r)
+    return phase_l, phase_r
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _fill_square(out_left, out_right, phase_l, phase_r, dphase_l, dphase_r, volume):
+    # sign(sin(2*pi*phase)) is just a test of which half-cycle we are in
+    for i in range(out_left.shape[0]):
+        out_left[i] = volume if phase_l < 0.5 else -volume
+        out_right[i] = volume if phase_r < 0.5 else -volume
+        phase_l += dphase_l
+        phase_l -= math.floor(phase_l)
+        phase_r += dphase_r
+        phase_r -= math.floor(phase_r)
+    return phase_l, phase_r
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _fill_saw(out_left, out_right, phase_l, phase_r, dphase_l, dphase_r, volume):
+    for i in range(out_left.shape[0]):
+        out_left[i] = 2.0 * volume * (phase_l if phase_l < 0.5 else phase_l - 1.0)
+        out_right[i] = 2.0 * volume * (phase_r if phase_r < 0.5 else phase_r - 1.0)
+        phase_l += dphase_l
+        phase_l -= math.floor(phase_l)
+        phase_r += dphase_r
+        phase_r -= math.floor(phase_r)
+    return phase_l, phase_r
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _fill_tri(out_left, out_right, phase_l, phase_r, dphase_l, dphase_r, volume):
+    for i in range(out_left.shape[0]):
+        out_left[i] = volume * (4.0 * abs(phase_l if phase_l < 0.5 else phase_l - 1.0) - 1.0)
+        out_right[i] = volume * (4.0 * abs(phase_r if phase_r < 0.5 else phase_r - 1.0) - 1.0)
+        phase_l += dphase_l
+        phase_l -= math.floor(phase_l)
+        phase_r += dphase_r
+        phase_r -= math.floor(phase_r)
+    return phase_l, phase_r
+
+
+_KERNELS = {
+    "sine": _fill_sine,
+    "square": _fill_square,
+    "sawtooth": _fill_saw,
+    "triangle": _fill_tri,
+}
+
+
+def warm_kernels():
+    """Compile every waveform kernel ahead of the first request
+
+    The jitted fastmath loops are the SIMD fast path (LLVM autovectorizes
+    them for the host CPU, AVX2 included). Triggering compilation at
+    startup keeps JIT latency out of the first streamed buffer.
+    """
+    scratch = np.empty((2, 8), dtype=np.float32)
+    for kernel in _KERNELS.values():
+        kernel(scratch[0], scratch[1], 0.0, 0.0, 0.01, 0.011, 0.5)
+
+
 # Audio Generation Engine
 class BinauralGenerator:
     """High-performance binaural beat generator with scientific accuracy"""
-    
+
     def __init__(self, sample_rate: int = SAMPLE_RATE):
         self.sample_rate = sample_rate
         self.buffer_size = BUFFER_SIZE
-        
-    def generate_waveform(self, frequency: float, duration: float, waveform: str = "sine") -> np.ndarray:
-        """Generate waveform with specified parameters"""
-        samples = int(duration * self.sample_rate)
-        t = np.linspace(0, duration, samples, False)
-        
-        if waveform == "sine":
-            return np.sin(2 * np.pi * frequency * t)
-        elif waveform == "square":
-            return np.sign(np.sin(2 * np.pi * frequency * t))
-        elif waveform == "sawtooth":
-            return 2 * (t * frequency - np.floor(0.5 + t * frequency))
-        elif waveform == "triangle":
-            return 2 * np.abs(2 * (t * frequency - np.floor(0.5 + t * frequency))) - 1
-        else:
-            raise ValueError(f"Unsupported waveform: {waveform}")
-    
+        # Oscillator phases in cycles, persisted across buffers so
+        # streamed chunks remain phase-continuous
+        self._phase_l = 0.0
+        self._phase_r = 0.0
+        # Reusable SoA output buffer: one contiguous float32 block holding
+        # both channels, refilled in place on every call
+        self._scratch = np.empty((2, self.buffer_size), dtype=np.float32)
+
     def generate_binaural_beats(self, config: BinauralConfig) -> AudioBuffer:
         """Generate binaural beats with perfect L/R channel separation"""
         try:
+            kernel = _KERNELS.get(config.waveform)
+            if kernel is None:
+                raise ValueError(f"Unsupported waveform: {config.waveform}")
+
             # Calculate frequencies for each ear
             left_freq = config.carrier_freq
             right_freq = config.carrier_freq + config.beat_freq
-            
-            # Generate buffer duration (streaming chunks)
-            buffer_duration = self.buffer_size / self.sample_rate
-            
-            # Generate waveforms
-            left_channel = self.generate_waveform(
-                left_freq, buffer_duration, config.waveform
-            ) * config.volume
-            
-            right_channel = self.generate_waveform(
-                right_freq, buffer_duration, config.waveform
-            ) * config.volume
-            
+
+            self._phase_l, self._phase_r = kernel(
+                self._scratch[0], self._scratch[1],
+                self._phase_l, self._phase_r,
+                left_freq / self.sample_rate, right_freq / self.sample_rate,
+                config.volume
+            )
+
             # Apply anti-aliasing filter (simple low-pass)
             nyquist = self.sample_rate / 2
             if config.carrier_freq > nyquist * 0.8:
-                logger.warning(f"Frequency {config.carrier_freq}Hz near Nyquist limit")
+                logger.warning("Frequency %sHz near Nyquist limit", config.carrier_freq)
             
             return AudioBuffer(
-                left_channel=left_channel,
-                right_channel=right_channel,
-                timestamp=time.time()
+                samples=self._scratch,
+                timestamp=time.monotonic()
             )
             
         except Exception as e:
-            logger.error(f"Audio generation error: {e}")
+            logger.error("Audio generation error: %s", e)
             raise HTTPException(status_code=500, detail="Audio generation failed")
 
+# Loopable buffer cache for deterministic configs. A one-second buffer
+# contains a whole number of cycles for integer per-ear frequencies (all
+# presets qualify), so slicing it in a loop is click-free and costs no
+# generation work per chunk. The key is user-controlled (any authorized
+# caller can mint distinct volumes), so the cache is LRU-bounded:
+# 32 entries x ~176 KB keeps the worst case under ~6 MB. Only touched on
+# the event-loop thread.
+_LOOP_CACHE: LRUCache = LRUCache(maxsize=32)
+
+
+def get_loop_buffer(config: BinauralConfig) -> Optional[np.ndarray]:
+    """Return a cached interleaved int16 PCM loop for config, or None
+
+    Configs with non-integer per-ear frequencies cannot be looped
+    seamlessly at one-second length and fall back to live generation.
+    """
+    left_freq = config.carrier_freq
+    right_freq = config.carrier_freq + config.beat_freq
+    if left_freq != int(left_freq) or right_freq != int(right_freq):
+        return None
+
+    key = (left_freq, right_freq, config.waveform, config.volume)
+    loop_buffer = _LOOP_CACHE.get(key)
+    if loop_buffer is None:
+        scratch = np.empty((2, SAMPLE_RATE), dtype=np.float32)
+        _KERNELS[config.waveform](
+            scratch[0], scratch[1], 0.0, 0.0,
+            left_freq / SAMPLE_RATE, right_freq / SAMPLE_RATE, config.volume
+        )
+        interleaved = np.empty(2 * SAMPLE_RATE, dtype=np.float32)
+        interleaved[0::2] = scratch[0]
+        interleaved[1::2] = scratch[1]
+        # Quantize once at build time; int16 PCM halves the wire bytes
+        loop_buffer = (interleaved * 32767.0).astype(np.int16)
+        _LOOP_CACHE[key] = loop_buffer
+        logger.info("Cached loop buffer for %s", key)
+    return loop_buffer
+
+
+# Monotonic serial for collision-free session IDs
+_next_session_serial = itertools.count().__next__
+
+
+class _SessionStore(TTLCache):
+    """Session TTLCache that reports every eviction to its owner
+
+    Both eviction paths are covered: expire() handles TTL lapses (and is
+    what the base class calls internally on mutation), popitem() handles
+    maxsize pressure. Without this, sessions that were created but never
+    streamed or ended would leave the active-session counter drifting
+    upward forever.
+    """
+
+    def __init__(self, on_evict, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._on_evict = on_evict
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for _session_id, session in expired:
+            self._on_evict(session)
+        return expired
+
+    def popitem(self):
+        session_id, session = super().popitem()
+        self._on_evict(session)
+        return session_id, session
+
+
 # Session Management
 class SessionManager:
     """Manage active binaural beat sessions"""
-    
+
+    # Bounded store: sessions that are never explicitly ended expire on
+    # their own instead of leaking. TTL is twice the maximum session
+    # duration so running streams always outlive their entry.
+    MAX_SESSIONS = 10_000
+    SESSION_TTL = 2 * 3600
+
     def __init__(self):
-        self.sessions: Dict[str, SessionData] = {}
+        self.sessions: TTLCache = _SessionStore(
+            self._note_evicted, maxsize=self.MAX_SESSIONS, ttl=self.SESSION_TTL
+        )
         self.active_connections: Dict[str, WebSocket] = {}
-    
+        self._active_count = 0
+        self._total_count = 0
+
+    def _note_evicted(self, session: SessionData):
+        """Keep the active counter honest when the store drops an entry"""
+        if session.is_active:
+            session.is_active = False
+            self._active_count = max(0, self._active_count - 1)
+
+    @property
+    def active_count(self) -> int:
+        """Number of active sessions, maintained without scanning"""
+        self.sessions.expire()  # fold any pending TTL evictions in first
+        return self._active_count
+
+    @property
+    def total_count(self) -> int:
+        """Total sessions created over the process lifetime"""
+        return self._total_count
+
     def create_session(self, config: BinauralConfig) -> str:
         """Create new listening session"""
-        session_id = f"session_{int(time.time())}_{hash(str(config)) % 10000}"
-        
+        session_id = f"session_{int(time.time() * 1000):x}_{_next_session_serial():x}"
+
         session = SessionData(
             session_id=session_id,
             config=config,
             start_time=datetime.now()
         )
-        
+
         self.sessions[session_id] = session
-        logger.info(f"Created session {session_id}")
+        self._active_count += 1
+        self._total_count += 1
+        logger.info("Created session %s", session_id)
         return session_id
-    
+
     def get_session(self, session_id: str) -> Optional[SessionData]:
         """Get session by ID"""
         return self.sessions.get(session_id)
-    
+
     def end_session(self, session_id: str):
         """End session and cleanup"""
-        if session_id in self.sessions:
-            self.sessions[session_id].is_active = False
-            if session_id in self.active_connections:
-                del self.active_connections[session_id]
-            logger.info(f"Ended session {session_id}")
+        session = self.sessions.get(session_id)
+        if session is not None:
+            if session.is_active:
+                session.is_active = False
+                self._active_count = max(0, self._active_count - 1)
+            self.active_connections.pop(session_id, None)
+            logger.info("Ended session %s", session_id)
+
+    def deactivate_session(self, session_id: str):
+        """Session teardown that leaves the store entry in place
+
+        Bulk shutdown deactivates every session and then calls clear_all
+        once, rather than paying a per-entry delete on the store.
+        """
+        session = self.sessions.get(session_id)
+        if session is not None and session.is_active:
+            session.is_active = False
+            self._active_count = max(0, self._active_count - 1)
+
+    def clear_all(self):
+        """Drop every session and connection reference in one sweep"""
+        self.sessions.clear()
+        self.active_connections.clear()
 
 # Authentication
 security = HTTPBearer()
 
 def create_access_token(user_id: str) -> str:
     """Create JWT token for user"""
+    now = int(time.time())
     payload = {
         "user_id": user_id,
-        "exp": datetime.utcnow() + timedelta(hours=24),
-        "iat": datetime.utcnow()
+        "exp": now + 24 * 3600,
+        "iat": now
     }
     return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
 
+# Verified-token cache: a token is self-verifying once validated, so
+# repeat presentations within its lifetime reduce to a dict lookup.
+# verify_token is a sync dependency and runs on FastAPI's threadpool,
+# and TTLCache is not thread-safe, so every access takes the lock.
+_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=24 * 3600)
+_token_cache_lock = threading.Lock()
+
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Verify JWT token and return user_id"""
+    token = credentials.credentials
+
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+        if cached is not None:
+            user_id, exp = cached
+            if exp > time.time():
+                return user_id
+            _token_cache.pop(token, None)
+    if cached is not None:  # cached but past exp
+        raise HTTPException(status_code=401, detail="Token expired")
+
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=["HS256"])
-        return payload["user_id"]
+        payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+        user_id = payload["user_id"]
+        with _token_cache_lock:
+            _token_cache[token] = (user_id, payload.get("exp", math.inf))
+        return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
@@ -188,6 +437,47 @@ app.add_middleware(
 generator = BinauralGenerator()
 session_manager = SessionManager()
 
+# Shutdown drain: bounded wait for in-flight requests before exiting
+DRAIN_SECONDS = int(os.getenv("DRAIN_SECONDS", "30"))
+app.state.active_requests = 0
+
+# Set the moment SIGTERM/SIGINT lands so long-running streams can wind
+# down while the server is still closing its listeners
+_shutdown_requested = asyncio.Event()
+
+
+def _install_signal_handlers():
+    """Chain SIGTERM/SIGINT so shutdown intent reaches the stream loops
+
+    The server installs its own handlers for graceful shutdown; wrap
+    them rather than replace them, flagging the shutdown event first and
+    then deferring to the original handler.
+    """
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(signum)
+
+        def _handler(sig, frame, _previous=previous):
+            _shutdown_requested.set()
+            if callable(_previous):
+                _previous(sig, frame)
+
+        try:
+            signal.signal(signum, _handler)
+        except (ValueError, OSError):
+            # Not the main thread (e.g. some worker setups); the server's
+            # own handlers still provide graceful shutdown
+            return
+
+
+@app.middleware("http")
+async def track_active_requests(request: Request, call_next):
+    """Count in-flight requests so shutdown can drain them"""
+    app.state.active_requests += 1
+    try:
+        return await call_next(request)
+    finally:
+        app.state.active_requests -= 1
+
 # Preset configurations
 PRESETS = {
     "focus": BinauralConfig(carrier_freq=200, beat_freq=40, waveform="sine", duration=1800),
@@ -197,11 +487,9 @@ PRESETS = {
     "meditation": BinauralConfig(carrier_freq=120, beat_freq=4, waveform="sine", duration=2400),
 }
 
-# API Routes
-@app.get("/", response_class=HTMLResponse)
-async def get_frontend():
-    """Serve the main UI"""
-    return """
+# Frontend payload, encoded once at import time so requests serve cached
+# bytes with conditional-GET support instead of re-encoding ~10 KB each hit
+_FRONTEND_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -578,7 +866,21 @@ async def get_frontend():
         </script>
     </body>
     </html>
-    """
+    """.encode("utf-8")
+_FRONTEND_ETAG = hashlib.blake2b(_FRONTEND_HTML, digest_size=8).hexdigest()
+_FRONTEND_HEADERS = {"etag": _FRONTEND_ETAG, "cache-control": "public, max-age=3600"}
+
+
+# API Routes
+@app.get("/", response_class=HTMLResponse)
+async def get_frontend(request: Request):
+    """Serve the main UI"""
+    if request.headers.get("if-none-match") == _FRONTEND_ETAG:
+        return Response(status_code=304, headers=_FRONTEND_HEADERS)
+    return Response(
+        content=_FRONTEND_HTML, media_type="text/html", headers=_FRONTEND_HEADERS
+    )
+
 
 @app.get("/health")
 async def health_check():
@@ -592,15 +894,15 @@ async def health_check():
             "active_connections": len(session_manager.active_connections),
             "version": "1.0.0",
             "environment": os.getenv("ENVIRONMENT", "unknown"),
-            "port": os.getenv("PORT", "8000"),
+            "port": PORT,
             "uptime": time.time() - startup_time if 'startup_time' in globals() else 0
         }
         
-        logger.info(f"Health check: {health_data['status']}")
+        logger.info("Health check: %s", health_data["status"])
         return health_data
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         return {
             "status": "unhealthy",
             "error": str(e),
@@ -613,25 +915,46 @@ async def get_demo_token():
     token = create_access_token("demo_user")
     return {"access_token": token, "token_type": "bearer"}
 
+# Presets never change at runtime; encode the response once at import time
+_PRESETS_JSON = json.dumps({
+    "presets": {
+        name: {
+            "carrier_freq": config.carrier_freq,
+            "beat_freq": config.beat_freq,
+            "waveform": config.waveform,
+            "duration": config.duration,
+            "description": f"Optimized for {name.replace('_', ' ')}"
+        }
+        for name, config in PRESETS.items()
+    }
+}).encode("utf-8")
+
+
+def _config_payload(config: BinauralConfig) -> dict:
+    """Response dict for a config, without a generic serializer pass"""
+    return {
+        "carrier_freq": config.carrier_freq,
+        "beat_freq": config.beat_freq,
+        "waveform": config.waveform,
+        "duration": config.duration,
+        "volume": config.volume
+    }
+
+
 @app.get("/beats/presets")
 async def get_presets():
     """Get available binaural beat presets"""
-    return {
-        "presets": {
-            name: {
-                "carrier_freq": config.carrier_freq,
-                "beat_freq": config.beat_freq,
-                "waveform": config.waveform,
-                "duration": config.duration,
-                "description": f"Optimized for {name.replace('_', ' ')}"
-            }
-            for name, config in PRESETS.items()
-        }
-    }
+    return Response(content=_PRESETS_JSON, media_type="application/json")
 
 @app.post("/beats/generate")
-async def generate_beats(config: BinauralConfig, user_id: str = Depends(verify_token)):
+async def generate_beats(request: Request, user_id: str = Depends(verify_token)):
     """Generate custom binaural beats configuration"""
+    try:
+        config = _CONFIG_DECODER.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    validate_config(config)
+
     try:
         # Validate configuration
         if config.carrier_freq + config.beat_freq > 1000:
@@ -648,13 +971,13 @@ async def generate_beats(config: BinauralConfig, user_id: str = Depends(verify_t
         
         return {
             "session_id": session_id,
-            "config": config.dict(),
+            "config": _config_payload(config),
             "status": "ready",
             "estimated_quality": "high" if config.carrier_freq < 500 else "medium"
         }
         
     except Exception as e:
-        logger.error(f"Beat generation error: {e}")
+        logger.error("Beat generation error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/sessions/{session_id}")
@@ -664,11 +987,11 @@ async def get_session_info(session_id: str, user_id: str = Depends(verify_token)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    duration_played = (datetime.now() - session.start_time).total_seconds()
+    duration_played = time.monotonic() - session.start_mono
     
     return {
         "session_id": session_id,
-        "config": session.config.dict(),
+        "config": _config_payload(session.config),
         "start_time": session.start_time.isoformat(),
         "duration_played": duration_played,
         "is_active": session.is_active,
@@ -683,7 +1006,13 @@ async def end_session(session_id: str, user_id: str = Depends(verify_token)):
 
 @app.websocket("/beats/stream/{session_id}")
 async def websocket_audio_stream(websocket: WebSocket, session_id: str):
-    """WebSocket endpoint for real-time audio streaming"""
+    """WebSocket endpoint for real-time audio streaming
+
+    Audio is sent as binary frames: a 16-byte little-endian header
+    (uint32 seq, uint32 frames, float32 sample_rate, float32 timestamp)
+    followed by interleaved int16 PCM L/R samples. Control/status
+    messages remain JSON text frames.
+    """
     await websocket.accept()
     
     session = session_manager.get_session(session_id)
@@ -692,68 +1021,111 @@ async def websocket_audio_stream(websocket: WebSocket, session_id: str):
         return
     
     session_manager.active_connections[session_id] = websocket
-    logger.info(f"WebSocket connected for session {session_id}")
+    logger.info("WebSocket connected for session %s", session_id)
     
     try:
-        start_time = time.time()
-        
-        while session.is_active and time.time() - start_time < session.config.duration:
-            # Generate audio buffer
-            audio_buffer = generator.generate_binaural_beats(session.config)
-            
-            # Convert to JSON-serializable format
-            audio_data = {
-                "left_channel": audio_buffer.left_channel.tolist(),
-                "right_channel": audio_buffer.right_channel.tolist(),
-                "timestamp": audio_buffer.timestamp,
-                "sample_rate": SAMPLE_RATE,
-                "buffer_size": BUFFER_SIZE
-            }
-            
-            # Send to client
-            await websocket.send_json(audio_data)
-            
-            # Wait for next buffer (maintain real-time streaming)
-            await asyncio.sleep(BUFFER_SIZE / SAMPLE_RATE)
+        start_mono = time.monotonic()
+        seq = 0
+
+        # Per-connection reusable buffers: one float32 interleave scratch
+        # and one wire frame (header + int16 PCM) refilled in place, so
+        # the steady-state loop allocates nothing
+        interleaved = np.empty(2 * BUFFER_SIZE, dtype=np.float32)
+        frame_buf = bytearray(16 + 2 * BUFFER_SIZE * 2)
+        pcm_view = np.frombuffer(memoryview(frame_buf)[16:], dtype=np.int16)
+
+        # Deadline-based pacing: advancing a monotonic deadline by one
+        # frame period per chunk keeps long sessions locked to wall clock
+        # instead of accumulating sleep + generation drift. Starting the
+        # deadline two frames in the past sends a jitter cushion upfront.
+        loop = asyncio.get_running_loop()
+        frame_period = BUFFER_SIZE / SAMPLE_RATE
+        deadline = loop.time() - 2 * frame_period
+
+        # Deterministic configs stream slices of a cached loop buffer
+        # instead of regenerating identical audio every chunk
+        loop_buffer = get_loop_buffer(session.config)
+        offset = 0
+
+        # Each connection gets its own generator: live generation runs on
+        # the thread pool, so the scratch buffer and oscillator phases
+        # must not be shared between concurrent streams
+        session_generator = BinauralGenerator() if loop_buffer is None else None
+
+        while (session.is_active
+               and not _shutdown_requested.is_set()
+               and time.monotonic() - start_mono < session.config.duration):
+            if loop_buffer is not None:
+                loop_len = len(loop_buffer)
+                end = offset + 2 * BUFFER_SIZE
+                if end <= loop_len:
+                    pcm_view[:] = loop_buffer[offset:end]
+                else:  # wrap around the loop boundary
+                    head = loop_len - offset
+                    pcm_view[:head] = loop_buffer[offset:]
+                    pcm_view[head:] = loop_buffer[:end - loop_len]
+                offset = end % loop_len
+                timestamp = time.monotonic()
+            else:
+                # Generate off the event loop; the nogil kernels let
+                # concurrent sessions fill buffers in parallel threads
+                audio_buffer = await asyncio.to_thread(
+                    session_generator.generate_binaural_beats, session.config
+                )
+                interleaved[0::2] = audio_buffer.left_channel
+                interleaved[1::2] = audio_buffer.right_channel
+                np.multiply(interleaved, 32767.0, out=interleaved)
+                np.copyto(pcm_view, interleaved, casting="unsafe")
+                timestamp = audio_buffer.timestamp
+
+            # Frame as binary: 16-byte header + interleaved int16 PCM samples
+            struct.pack_into(
+                "<IIff", frame_buf, 0, seq, BUFFER_SIZE, float(SAMPLE_RATE), timestamp
+            )
+
+            # Send an immutable snapshot: the frame buffer is rewritten in
+            # place next iteration, and the transport may queue frames, so
+            # handing it the live bytearray would alias every queued frame
+            await websocket.send_bytes(bytes(frame_buf))
+            seq += 1
+
+            # Wait until the next frame deadline (maintain real-time streaming)
+            deadline += frame_period
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
         
         # Session completed
         await websocket.send_json({"status": "completed", "message": "Session finished"})
         
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for session {session_id}")
+        logger.info("WebSocket disconnected for session %s", session_id)
     except Exception as e:
-        logger.error(f"WebSocket error for session {session_id}: {e}")
+        logger.error("WebSocket error for session %s: %s", session_id, e)
         await websocket.send_json({"status": "error", "message": str(e)})
     finally:
         session_manager.end_session(session_id)
 
-@app.get("/metrics")
+@app.get("/metrics", response_class=PlainTextResponse)
 async def get_metrics():
     """Prometheus-compatible metrics endpoint"""
-    active_sessions = len([s for s in session_manager.sessions.values() if s.is_active])
-    total_sessions = len(session_manager.sessions)
-    
-    metrics = f"""
+    return f"""\
 # HELP binaural_active_sessions Number of active binaural beat sessions
 # TYPE binaural_active_sessions gauge
-binaural_active_sessions {active_sessions}
+binaural_active_sessions {session_manager.active_count}
 
 # HELP binaural_total_sessions Total number of sessions created
 # TYPE binaural_total_sessions counter
-binaural_total_sessions {total_sessions}
+binaural_total_sessions {session_manager.total_count}
 
 # HELP binaural_websocket_connections Number of active WebSocket connections
 # TYPE binaural_websocket_connections gauge
 binaural_websocket_connections {len(session_manager.active_connections)}
 """
-    
-    return JSONResponse(content=metrics, media_type="text/plain")
 
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Global HTTP exception handler"""
-    logger.error(f"HTTP {exc.status_code}: {exc.detail}")
+    logger.error("HTTP %s: %s", exc.status_code, exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "timestamp": datetime.now().isoformat()}
@@ -762,7 +1134,7 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {exc}")
+    logger.error("Unhandled exception: %s", exc)
     return JSONResponse(
         status_code=500,
         content={"error": "Internal server error", "timestamp": datetime.now().isoformat()}
@@ -772,28 +1144,89 @@ async def general_exception_handler(request, exc):
 @app.on_event("startup")
 async def startup_event():
     """Application startup"""
-    logger.info("🎵 Binaural Beats Generator MVP starting up...")
-    logger.info(f"📊 Sample rate: {SAMPLE_RATE}Hz, Buffer size: {BUFFER_SIZE}")
-    logger.info(f"🌐 Port: {os.getenv('PORT', 8000)}")
-    logger.info(f"🔒 JWT Secret configured: {'Yes' if JWT_SECRET else 'No'}")
-    logger.info("✅ Application startup complete!")
+    warm_kernels()
+    _install_signal_handlers()
+    # One log call instead of five: each record acquires the logging
+    # lock and flushes the handler, which serializes startup on slow stderr
+    logger.info(
+        "🎵 Binaural Beats Generator MVP starting up...\n"
+        "🔥 Waveform kernels compiled for this host CPU\n"
+        "📊 Sample rate: %sHz, Buffer size: %s\n"
+        "🌐 Port: %s\n"
+        "🔒 JWT Secret configured: %s\n"
+        "✅ Application startup complete!",
+        SAMPLE_RATE, BUFFER_SIZE, PORT, JWT_CONFIGURED
+    )
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown"""
     logger.info("🛑 Shutting down Binaural Beats Generator MVP...")
-    # End all active sessions
-    for session_id in list(session_manager.sessions.keys()):
-        session_manager.end_session(session_id)
-    logger.info("✅ Shutdown complete!")
+    if _shutdown_requested.is_set():
+        logger.info("Shutdown was signal-initiated; streams are already winding down")
+
+    # Give in-flight requests a bounded window to finish so redeploys
+    # don't surface client-visible 502s
+    drain_deadline = time.monotonic() + DRAIN_SECONDS
+    while app.state.active_requests > 0 and time.monotonic() < drain_deadline:
+        await asyncio.sleep(0.1)
+    if app.state.active_requests > 0:
+        logger.warning(
+            "Drain window expired with %s request(s) in flight",
+            app.state.active_requests
+        )
+
+    shutdown_start = time.monotonic()
+    # tuple() iterates the dict directly (no keys-view hop) and snapshots
+    # it against mutation while teardown runs
+    session_ids = tuple(session_manager.sessions)
+    # Teardown is a dict lookup plus a flag flip per session; a plain
+    # loop beats funneling thousands of trivial tasks through the
+    # threadpool
+    for session_id in session_ids:
+        session_manager.deactivate_session(session_id)
+    # One clear instead of per-entry deletes while iterating
+    session_manager.clear_all()
+    elapsed = time.monotonic() - shutdown_start
+    logger.info("✅ Shutdown complete! Ended %d session(s) in %.2fs", len(session_ids), elapsed)
 
 if __name__ == "__main__":
-    port = int(os.getenv("PORT", 8000))
-    logger.info(f"🚀 Starting server on port {port}")
+    # Only the direct-run path needs these; keeping them out of module
+    # scope trims import time for launcher- and worker-spawned processes
+    import uvicorn
+    import uvloop
+
+    uvloop.install()
+    # Default to a single worker: sessions, the token cache, and metrics
+    # live in per-worker memory, so the full flow only works multi-worker
+    # behind sticky routing or a shared store (see README "Scaling beyond
+    # one worker")
+    workers = int(os.getenv("WEB_CONCURRENCY") or os.getenv("UVICORN_WORKERS") or 1)
+    if workers > 1:
+        logger.warning(
+            "WEB_CONCURRENCY=%s: session state is per-worker; multi-worker "
+            "requires session affinity at the proxy or an external session "
+            "store, or streams will fail with 'Session not found'",
+            workers
+        )
+    logger.info("🚀 Starting server on port %s with %s worker(s)", PORT, workers)
+    logger.info("🔁 Event loop policy: %s", type(asyncio.get_event_loop_policy()).__name__)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
-        port=port,
+        port=PORT,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # Audio frames are near-incompressible; per-message deflate would
+        # only burn CPU on the streaming path
+        ws_per_message_deflate=False,
+        ws_max_size=1 << 20,
         log_level="info",
-        access_log=True
+        # Per-request access logging is one of the largest non-app costs
+        # in uvicorn; keep it opt-in for debugging
+        access_log=bool(int(os.getenv("ACCESS_LOG", "0"))),
+        server_header=False,
+        proxy_headers=True
     )
@@ -4,54 +4,109 @@ Railway startup script that properly handles the PORT environment variable
 """
 import os
 import sys
-import subprocess
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Read the environment once at import; everything below uses the cached values
+PORT = os.environ.get("PORT", "8000")
+JWT_CONFIGURED = "Yes" if os.environ.get("JWT_SECRET") else "No"
+
 def main():
     """Start the uvicorn server with proper port handling"""
-    
-    # Get port from environment variable, default to 8000
-    port = os.getenv("PORT", "8000")
-    
-    # Validate port
+
+    # Validate port; range problems are left to bind(), which rejects
+    # them with a clearer errno than we could synthesize here
     try:
-        port_int = int(port)
-        if not (1 <= port_int <= 65535):
-            raise ValueError(f"Port {port_int} is out of valid range")
+        port = int(PORT)
     except ValueError as e:
-        logger.error(f"Invalid PORT value '{port}': {e}")
+        logger.error("Invalid PORT value '%s': %s", PORT, e)
         sys.exit(1)
     
-    logger.info(f"🚀 Starting Binaural Beats Generator on port {port}")
-    logger.info(f"🌐 Environment: {os.getenv('ENVIRONMENT', 'unknown')}")
-    logger.info(f"🔑 JWT Secret configured: {'Yes' if os.getenv('JWT_SECRET') else 'No'}")
-    
-    # Build uvicorn command
+    # Worker count is operator-tunable without code edits; WEB_CONCURRENCY
+    # is the platform convention, UVICORN_WORKERS accepted as an alias
+    raw_workers = os.environ.get("WEB_CONCURRENCY") or os.environ.get("UVICORN_WORKERS") or "1"
+    try:
+        workers = int(raw_workers)
+        if workers < 1:
+            raise ValueError("worker count must be >= 1")
+    except ValueError as e:
+        logger.error("Invalid worker count '%s': %s", raw_workers, e)
+        sys.exit(1)
+
+    access_log = os.environ.get("ACCESS_LOG", "0") == "1"
+
+    # Single log record keeps startup off the logging lock
+    logger.info(
+        "🚀 Starting Binaural Beats Generator on port %s\n"
+        "👷 Workers: %s\n"
+        "🌐 Environment: %s\n"
+        "🔑 JWT Secret configured: %s",
+        port, workers, os.getenv("ENVIRONMENT", "unknown"), JWT_CONFIGURED
+    )
+
+    if workers > 1:
+        # Sessions, the verified-token cache, and metrics counters all
+        # live in per-worker memory: without sticky routing the POST that
+        # creates a session and the WebSocket that streams it usually hit
+        # different workers and the stream fails with 4004. See README
+        # "Scaling beyond one worker".
+        logger.warning(
+            "WEB_CONCURRENCY=%s: session state is per-worker; multi-worker "
+            "requires session affinity at the proxy or an external session "
+            "store, or streams will fail with 'Session not found'",
+            workers
+        )
+        _exec_gunicorn(port, workers, access_log)
+
+    # Single worker: serve in-process. No fork, no second interpreter,
+    # no argv round-trip; signals are delivered straight to the server.
+    import uvicorn
+
+    config = uvicorn.Config(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        log_level="info",
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_per_message_deflate=False,
+        timeout_graceful_shutdown=30,
+        access_log=access_log
+    )
+    uvicorn.Server(config).run()
+
+
+def _exec_gunicorn(port, workers, access_log):
+    """Replace this process with a multi-worker gunicorn server"""
     cmd = [
-        "uvicorn",
+        "gunicorn",
         "main:app",
-        "--host", "0.0.0.0",
-        "--port", str(port),
-        "--workers", "1",
-        "--log-level", "info",
-        "--access-log"
+        "-k", "uvicorn.workers.UvicornWorker",
+        "-w", str(workers),
+        "-c", "gunicorn_conf.py",
+        "-b", f"0.0.0.0:{port}",
+        "--graceful-timeout", "30",
+        "--log-level", "info"
     ]
-    
-    logger.info(f"🔧 Running command: {' '.join(cmd)}")
-    
+
+    # Access logging costs a formatted log call per request; opt-in only
+    if access_log:
+        cmd += ["--access-logfile", "-"]
+
+    logger.info("🔧 Exec: %s", " ".join(cmd))
+
     try:
-        # Start uvicorn
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Failed to start server: {e}")
+        # Replace this process image with the server so platform signals
+        # (SIGTERM on redeploy) reach it directly, with no idle Python
+        # wrapper holding PID 1
+        os.execvp(cmd[0], cmd)
+    except OSError as e:
+        logger.error("❌ Failed to exec server: %s", e)
         sys.exit(1)
-    except KeyboardInterrupt:
-        logger.info("🛑 Server stopped by user")
-        sys.exit(0)
 
 if __name__ == "__main__":
     main()